@@ -1,6 +1,16 @@
 from Person import Person
 from Person import DeceasedPerson
 from Person import Parent
+import json
+import threading
+from contextlib import contextmanager
+from datetime import date
+from Statistics import ValueSketch
+from Timeline import IntervalIndex, parse_date
+
+# Number of locks shared out between people; two people may share one, which is safe but less parallel
+LOCK_STRIPES = 64
+
 
 class FamilyTree:
     """
@@ -18,6 +28,13 @@ class FamilyTree:
         Initializes an empty family tree.
         """
         self.members = {}  # Dictionary to store members by their name
+        self.lifespans = IntervalIndex()  # Birth-to-death intervals keyed by name
+        self.partnerships = IntervalIndex()  # Dated partnerships keyed by (name, partner name, start)
+        self.partnership_keys = {}  # Dictionary of name -> keys of that person's dated partnerships
+        # Relationship changes lock the people involved, always in stripe order so threads cannot deadlock.
+        # The index lock guards members and the date indexes, and is always taken after any stripes.
+        self._lock_stripes = [threading.RLock() for _ in range(LOCK_STRIPES)]
+        self._index_lock = threading.RLock()
 
     def add_person(self, person):
         """
@@ -31,9 +48,64 @@ class FamilyTree:
         """
         if not isinstance(person, Person):
             raise ValueError("Only Person objects can be added to the family tree.")
-        if person.name in self.members:
-            raise ValueError(f"A person named {person.name} already exists in the family tree.")
-        self.members[person.name] = person
+        with self._index_lock:
+            if person.name in self.members:
+                raise ValueError(f"A person named {person.name} already exists in the family tree.")
+            self.members[person.name] = person
+            self._index_lifespan(person)
+
+    def _index_lifespan(self, person):
+        """
+        Adds a person's birth and death dates to the lifespan index, if the birth date is known.
+
+        Args:
+            person (Person): The person to index.
+        """
+        birth = parse_date(person.birth_date)
+        death = parse_date(getattr(person, "death_date", None))
+        if birth is not None and (death is None or death >= birth):
+            self.lifespans.add(person.name, birth, death)
+
+    def update_dates(self, name, birth_date=None, death_date=None):
+        """
+        Changes a member's birth or death date and updates the lifespan index to match.
+
+        Args:
+            name (str): The name of the person.
+            birth_date (str, optional): The new birth date. Defaults to None to keep the current one.
+            death_date (str, optional): The new death date. Defaults to None to keep the current one.
+
+        Raises:
+            ValueError: If the person is not in the tree or a date is invalid.
+        """
+        for value in (birth_date, death_date):
+            if value is not None:
+                self._require_date(value)
+        person = self._require_person(name)
+        with self._lock_people([person]):
+            self._check_members([person])
+            with self._index_lock:
+                if birth_date is not None:
+                    person.birth_date = birth_date
+                if death_date is not None:
+                    person.death_date = death_date
+                self.lifespans.remove(name)
+                self._index_lifespan(person)
+
+    def record_death(self, name, death_date):
+        """
+        Records the date a member died, so that "as of date" queries no longer count them as alive.
+
+        Only DeceasedPerson members are counted in the age-at-death statistics.
+
+        Args:
+            name (str): The name of the person.
+            death_date (str): Date of death in 'DD/MM/YYYY' or 'YYYY-MM-DD' format.
+
+        Raises:
+            ValueError: If the person is not in the tree or the date is invalid.
+        """
+        self.update_dates(name, death_date=death_date)
 
     def get_person(self, name):
         """
@@ -47,6 +119,605 @@ class FamilyTree:
         """
         return self.members.get(name)
 
+    def get_members(self):
+        """
+        Retrieves every member of the family tree. Safe to call from several threads at once.
+
+        Returns:
+            list[Person]: The members at the time of the call. Later additions and removals
+            do not change the list, so it can be looped over while other threads change the tree.
+        """
+        with self._index_lock:
+            return list(self.members.values())
+
+    def remove_person(self, name):
+        """
+        Removes a person from the family tree and detaches them from every relationship.
+
+        Args:
+            name (str): The name of the person to remove.
+
+        Returns:
+            Person: The removed person.
+
+        Raises:
+            ValueError: If no person with that name exists in the tree.
+        """
+        person = self._require_person(name)
+        with self._lock_people([person], person.get_relatives):
+            with self._index_lock:
+                if self.members.get(name) is not person:
+                    raise ValueError(f"No person named {name} found in the family tree.")
+                del self.members[name]
+                self.lifespans.remove(name)
+                for key in self.partnership_keys.pop(name, []):
+                    self.partnerships.remove(key)
+                    other_name = key[1] if key[0] == name else key[0]
+                    self.partnership_keys[other_name].remove(key)
+            person.detach()
+        return person
+
+    @contextmanager
+    def transaction(self, *names):
+        """
+        Locks a group of members so that a batch of relationship changes between them is
+        not interleaved with changes made by other threads.
+
+        Everyone whose relationships change must be included, for example the current partners
+        of anyone given a new partner. Transactions must not be nested.
+
+        Example:
+            with family_tree.transaction("María", "Juanito") as (maria, john):
+                maria.add_child(john)
+
+        Args:
+            *names (str): The names of the members involved.
+
+        Yields:
+            tuple[Person]: The members, in the order given.
+
+        Raises:
+            ValueError: If any of the people is not in the tree.
+        """
+        people = tuple(self._require_person(name) for name in names)
+        with self._lock_people(people):
+            self._check_members(people)
+            yield people
+
+    def link_child(self, parent_name, child_name):
+        """
+        Adds a child to a parent. Safe to call from several threads at once.
+
+        Args:
+            parent_name (str): The name of the parent.
+            child_name (str): The name of the child.
+
+        Raises:
+            ValueError: If either person is not in the tree.
+        """
+        with self.transaction(parent_name, child_name) as (parent, child):
+            parent.add_child(child)
+
+    def link_siblings(self, name, sibling_name):
+        """
+        Adds a mutual sibling relationship. Safe to call from several threads at once.
+
+        Args:
+            name (str): The name of one sibling.
+            sibling_name (str): The name of the other sibling.
+
+        Raises:
+            ValueError: If either person is not in the tree.
+        """
+        with self.transaction(name, sibling_name) as (person, sibling):
+            person.add_sibling(sibling)
+
+    def link_partners(self, name, partner_name):
+        """
+        Makes two members each other's partner, moving any current partners to their past
+        partners. Safe to call from several threads at once.
+
+        Args:
+            name (str): The name of one partner.
+            partner_name (str): The name of the other partner.
+
+        Raises:
+            ValueError: If either person is not in the tree, or both names are the same.
+        """
+        person, partner = self._require_partners(name, partner_name)
+        with self._lock_people([person, partner], lambda: [person.partner, partner.partner]):
+            self._check_members([person, partner])
+            person.set_partner(partner)
+
+    def unlink_child(self, parent_name, child_name):
+        """
+        Removes a child from a parent. Safe to call from several threads at once.
+
+        Args:
+            parent_name (str): The name of the parent.
+            child_name (str): The name of the child.
+
+        Raises:
+            ValueError: If either person is not in the tree, or the child is not the parent's child.
+        """
+        with self.transaction(parent_name, child_name) as (parent, child):
+            parent.unlink_child(child)
+
+    def unlink_siblings(self, name, sibling_name):
+        """
+        Removes a mutual sibling relationship. Safe to call from several threads at once.
+
+        Args:
+            name (str): The name of one sibling.
+            sibling_name (str): The name of the other sibling.
+
+        Raises:
+            ValueError: If either person is not in the tree, or they are not siblings.
+        """
+        with self.transaction(name, sibling_name) as (person, sibling):
+            person.unlink_sibling(sibling)
+
+    def _get_stripe(self, person):
+        """
+        Returns:
+            int: The index of the lock stripe covering a person.
+        """
+        return hash(person.name) % len(self._lock_stripes)
+
+    @contextmanager
+    def _lock_people(self, people, get_involved=None):
+        """
+        Holds the locks of a group of people, acquired in stripe order.
+
+        Args:
+            people (list[Person]): The people to lock.
+            get_involved (callable, optional): Returns other people the change will touch, such as
+                current partners. It is called again once the locks are held, and if anyone new has
+                appeared the locks are released and taken again to include them.
+        """
+        involved = set(people)
+        if get_involved is not None:
+            involved.update(other for other in get_involved() if other is not None)
+        while True:
+            stripes = sorted({self._get_stripe(other) for other in involved})
+            for stripe in stripes:
+                self._lock_stripes[stripe].acquire()
+            if get_involved is None:
+                break
+            current = [other for other in get_involved() if other is not None]
+            if all(self._get_stripe(other) in stripes for other in current):
+                break
+            for stripe in reversed(stripes):
+                self._lock_stripes[stripe].release()
+            involved.update(current)
+        try:
+            yield
+        finally:
+            for stripe in reversed(stripes):
+                self._lock_stripes[stripe].release()
+
+    def _check_members(self, people):
+        """
+        Checks that locked people have not been removed from the tree in the meantime.
+
+        Raises:
+            ValueError: If any of the people is no longer in the tree.
+        """
+        for person in people:
+            if self.members.get(person.name) is not person:
+                raise ValueError(f"No person named {person.name} found in the family tree.")
+
+    def record_partnership(self, name, partner_name, start_date, end_date=None):
+        """
+        Records a dated partnership between two members and links them as partners.
+
+        An open partnership (no end date) becomes the current partnership of both people,
+        and any other open partnership either of them had is closed on its start date. If
+        either of them already has an open partnership that started later, the new one is
+        recorded as ending on that later start date instead. A closed partnership is
+        recorded as a past partnership. The same couple gets the same partnership whichever
+        name is given first.
+
+        Args:
+            name (str): The name of one partner.
+            partner_name (str): The name of the other partner.
+            start_date (str): Date the partnership started, in 'DD/MM/YYYY' or 'YYYY-MM-DD' format.
+            end_date (str, optional): Date the partnership ended. Defaults to None if ongoing.
+
+        Raises:
+            ValueError: If either person is not in the tree, both names are the same, or the dates are invalid.
+        """
+        person, partner = self._require_partners(name, partner_name)
+        start = parse_date(start_date)
+        end = parse_date(end_date)
+        if start is None or (end_date is not None and end is None):
+            raise ValueError("Partnership dates must be valid dates.")
+
+        with self._lock_people([person, partner], lambda: [person.partner, partner.partner]):
+            self._check_members([person, partner])
+            key = self._partnership_key(name, partner_name, start)
+            with self._index_lock:
+                if end is None:
+                    open_keys = [other_key for member_name in key[:2]
+                                 for other_key in self.partnership_keys.get(member_name, [])
+                                 if other_key != key and self.partnerships.get(other_key)[1] == date.max]
+                    later_starts = [other_key[2] for other_key in open_keys if other_key[2] > start]
+                    if later_starts:
+                        # A partnership that started later has already replaced this one
+                        end = min(later_starts)
+                    else:
+                        for other_key in open_keys:
+                            self.partnerships.add(other_key, other_key[2], start)
+                self._index_partnership(key, end)
+            if end is None:
+                person.set_partner(partner)
+            else:
+                person.add_past_partner(partner)
+
+    @staticmethod
+    def _partnership_key(name, partner_name, start):
+        """
+        Returns:
+            tuple: (name, name, start date) of a partnership, with the names in alphabetical order.
+        """
+        first, second = sorted((name, partner_name))
+        return first, second, start
+
+    def _index_partnership(self, key, end):
+        """
+        Adds a dated partnership to the partnership index.
+
+        Args:
+            key (tuple): (name, partner name, start date) of the partnership.
+            end (date): Date the partnership ended, or None if ongoing.
+        """
+        self.partnerships.add(key, key[2], end)
+        for member_name in key[:2]:
+            keys = self.partnership_keys.setdefault(member_name, [])
+            if key not in keys:
+                keys.append(key)
+
+    def close_partnership(self, name, end_date):
+        """
+        Ends a person's current partnership on a given date.
+
+        Args:
+            name (str): The name of one partner.
+            end_date (str): Date the partnership ended.
+
+        Raises:
+            ValueError: If the person is not in the tree, has no partner, or the date is invalid.
+        """
+        person = self._require_person(name)
+        end = parse_date(end_date)
+        if end is None:
+            raise ValueError("The end date must be a valid date.")
+        with self._lock_people([person], lambda: [person.partner]):
+            if person.partner is None:
+                raise ValueError(f"{name} has no current partner.")
+
+            partner_name = person.partner.name
+            with self._index_lock:
+                for key in self.partnership_keys.get(name, []):
+                    start, current_end = self.partnerships.get(key)
+                    if partner_name in key[:2] and current_end == date.max:
+                        self.partnerships.add(key, start, end)
+            person.end_partnership()
+
+    def alive_on(self, on_date):
+        """
+        Retrieves the members alive on a given date.
+
+        Members without a known birth date are not included.
+
+        Args:
+            on_date (str or date): The date to check.
+
+        Returns:
+            list[Person]: The people alive on that date.
+        """
+        point = self._require_date(on_date)
+        with self._index_lock:
+            return [self.members[name] for name in self.lifespans.stab(point)]
+
+    def partnerships_on(self, on_date):
+        """
+        Retrieves every dated partnership active on a given date.
+
+        Args:
+            on_date (str or date): The date to check.
+
+        Returns:
+            list[tuple[str, str]]: Pairs of partner names, each in alphabetical order.
+        """
+        point = self._require_date(on_date)
+        with self._index_lock:
+            return [key[:2] for key in self.partnerships.stab(point)]
+
+    def partners_on(self, name, on_date):
+        """
+        Retrieves a person's partners on a given date, based on recorded partnership dates.
+
+        Args:
+            name (str): The name of the person.
+            on_date (str or date): The date to check.
+
+        Returns:
+            list[Person]: The person's partners on that date.
+        """
+        self._require_person(name)
+        point = self._require_date(on_date)
+        partners = []
+        with self._index_lock:
+            for key in self.partnership_keys.get(name, []):
+                start, end = self.partnerships.get(key)
+                if start <= point <= end:
+                    partners.append(self.members[key[1] if key[0] == name else key[0]])
+        return partners
+
+    def household_on(self, name, on_date):
+        """
+        Retrieves a person's household on a given date: the person, their partners, and
+        their children who were alive and under 18 on that date.
+
+        Args:
+            name (str): The name of the person.
+            on_date (str or date): The date to check.
+
+        Returns:
+            list[Person]: The household members, or an empty list if the person was not alive.
+        """
+        person = self._require_person(name)
+        point = self._require_date(on_date)
+        if not self._is_alive_on(person, point):
+            return []
+
+        household = [person]
+        with self._index_lock:
+            for partner in self.partners_on(name, point):
+                if self._is_alive_on(partner, point):
+                    household.append(partner)
+            for child in list(person.children):
+                if child not in household and self._is_alive_on(child, point):
+                    birth = self.lifespans.get(child.name)[0]
+                    age = point.year - birth.year - ((point.month, point.day) < (birth.month, birth.day))
+                    if age < 18:
+                        household.append(child)
+        return household
+
+    def _is_alive_on(self, person, point):
+        """
+        Checks a person's indexed lifespan against a date.
+        """
+        lifespan = self.lifespans.get(person.name)
+        return lifespan is not None and lifespan[0] <= point <= lifespan[1]
+
+    def _require_person(self, name):
+        """
+        Retrieves a member by name.
+
+        Raises:
+            ValueError: If no person with that name exists in the tree.
+        """
+        person = self.members.get(name)
+        if person is None:
+            raise ValueError(f"No person named {name} found in the family tree.")
+        return person
+
+    def _require_partners(self, name, partner_name):
+        """
+        Retrieves two different members who are about to become partners.
+
+        Raises:
+            ValueError: If either person is not in the tree, or both names are the same.
+        """
+        if name == partner_name:
+            raise ValueError(f"{name} cannot be their own partner.")
+        return self._require_person(name), self._require_person(partner_name)
+
+    @staticmethod
+    def _require_date(value):
+        """
+        Parses a query date.
+
+        Raises:
+            ValueError: If the value is not a valid date.
+        """
+        parsed = parse_date(value)
+        if parsed is None:
+            raise ValueError(f"Invalid date: {value}")
+        return parsed
+
+    def merge(self, other, threshold=0.75):
+        """
+        Merges another family tree into this one, detecting people present in both.
+
+        People from the other tree are compared with members of this tree that share their
+        normalized name and birth year. Matches scoring at least the threshold are merged
+        automatically, and their relationships are unified. People with only weaker matches,
+        or whose name is already taken, are left out of this tree and reported for review.
+        Everyone else is added as a new member.
+
+        Each person's relationships are unified while holding the locks of everyone involved,
+        so other threads may keep changing this tree, but they must not remove the people
+        being merged, and the other tree must not change during the merge.
+
+        Args:
+            other (FamilyTree): The tree to merge in. It is not modified.
+            threshold (float, optional): Minimum score for an automatic merge. Defaults to 0.75.
+
+        Returns:
+            dict: "merged" holds (other name, member name, score) tuples, "added" the names of
+            new members, and "review" (other name, [(candidate name, score), ...]) tuples.
+        """
+        # Imported here so that loading a tree does not pay for the merge code
+        from Merge import DuplicateDetector, copy_person
+
+        detector = DuplicateDetector(self)
+        report = {"merged": [], "added": [], "review": []}
+        mapping = {}  # Dictionary of person in other tree -> person in this tree
+
+        for person in other.get_members():
+            matches = detector.find_matches(person)
+            if matches and matches[0][1] >= threshold:
+                match, score = matches[0]
+                mapping[person] = match
+                report["merged"].append((person.name, match.name, score))
+                continue
+            if matches or person.name in self.members:
+                report["review"].append((person.name, [(match.name, score) for match, score in matches]))
+                continue
+            mapping[person] = copy_person(person)
+
+        for person, target in mapping.items():
+            if target.name not in self.members:
+                self.add_person(target)
+                report["added"].append(target.name)
+
+        for person, target in mapping.items():
+            with self._lock_people([target], lambda: [mapping.get(relative) for relative in person.get_relatives()]
+                                   + [target.partner]):
+                self._merge_relationships(person, target, mapping)
+
+        with other._index_lock:
+            intervals = list(other.partnerships.intervals.items())
+        with self._index_lock:
+            for key, (start, end) in intervals:
+                first, second = other.members[key[0]], other.members[key[1]]
+                if first in mapping and second in mapping:
+                    self._index_partnership(self._partnership_key(mapping[first].name, mapping[second].name, start),
+                                            None if end == date.max else end)
+        return report
+
+    @staticmethod
+    def _merge_relationships(person, target, mapping):
+        """
+        Copies a person's relationships onto their counterpart in this tree, skipping
+        relatives that were not merged and relationships that already exist.
+
+        Args:
+            person (Person): The person in the other tree.
+            target (Person): The matching person in this tree.
+            mapping (dict): People in the other tree mapped to people in this tree.
+        """
+        for child in person.children:
+            merged_child = mapping.get(child)
+            if merged_child is not None and merged_child not in target.children:
+                target.add_child(merged_child)
+
+        for sibling in person.siblings:
+            merged_sibling = mapping.get(sibling)
+            if merged_sibling is not None and merged_sibling is not target:
+                target.add_sibling(merged_sibling)
+
+        merged_partner = mapping.get(person.partner)
+        if (merged_partner is not None and merged_partner is not target
+                and target.partner is None and merged_partner.partner is None):
+            target.set_partner(merged_partner)
+
+        for past_partner in person.last_partners:
+            merged_past = mapping.get(past_partner)
+            if (merged_past is not None and merged_past is not target
+                    and merged_past is not target.partner and merged_past not in target.last_partners):
+                target.last_partners.append(merged_past)
+                merged_past.past_partner_of.append(target)
+
+        # Parents linked directly rather than through add_child
+        if target.mum is None and mapping.get(person.mum) is not None:
+            target.mum = mapping[person.mum]
+        if target.dad is None and mapping.get(person.dad) is not None:
+            target.dad = mapping[person.dad]
+
+    def save(self, path):
+        """
+        Saves the family tree, including relationships and dated partnerships, to a JSON file.
+
+        Args:
+            path (str): The file to write.
+        """
+        people = []
+        for person in self.get_members():
+            record = {
+                "type": type(person).__name__,
+                "name": person.name,
+                "gender": person.gender,
+                "birth_date": person.birth_date,
+                "children": [child.name for child in person.children],
+                "siblings": [sibling.name for sibling in person.siblings],
+                "partner": person.partner.name if person.partner else None,
+                "last_partners": person.get_past_partners(),
+                "mum": person.mum.name if person.mum else None,
+                "dad": person.dad.name if person.dad else None,
+            }
+            for field in PERSON_EXTRA_FIELDS:
+                if hasattr(person, field):
+                    record[field] = getattr(person, field)
+            people.append(record)
+
+        with self._index_lock:
+            intervals = list(self.partnerships.intervals.items())
+        partnerships = []
+        for key, (start, end) in intervals:
+            partnerships.append([key[0], key[1], start.isoformat(), None if end == date.max else end.isoformat()])
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"people": people, "partnerships": partnerships}, file, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a family tree saved with save().
+
+        Relationships are restored without taking any locks, as no other thread can reach
+        the new tree before it is returned.
+
+        Args:
+            path (str): The file to read.
+
+        Returns:
+            FamilyTree: The loaded family tree.
+
+        Raises:
+            ValueError: If the file refers to an unknown person type or relative.
+        """
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+
+        family_tree = cls()
+        for record in data["people"]:
+            person_class = PERSON_TYPES.get(record["type"])
+            if person_class is None:
+                raise ValueError(f"Unknown person type: {record['type']}")
+            person = person_class(record["name"], record["gender"], record["birth_date"])
+            for field in PERSON_EXTRA_FIELDS:
+                if field in record:
+                    setattr(person, field, record[field])
+            family_tree.add_person(person)
+
+        for record in data["people"]:
+            person = family_tree.members[record["name"]]
+            for child_name in record["children"]:
+                person.add_child(family_tree._require_person(child_name))
+            for sibling_name in record["siblings"]:
+                person.add_sibling(family_tree._require_person(sibling_name))
+            if record["partner"] and person.partner is None:
+                person.set_partner(family_tree._require_person(record["partner"]))
+            for partner_name in record["last_partners"]:
+                past_partner = family_tree._require_person(partner_name)
+                person.last_partners.append(past_partner)
+                past_partner.past_partner_of.append(person)
+
+        # Parents are restored last, as add_child links them by gender
+        for record in data["people"]:
+            person = family_tree.members[record["name"]]
+            person.mum = family_tree._require_person(record["mum"]) if record["mum"] else None
+            person.dad = family_tree._require_person(record["dad"]) if record["dad"] else None
+
+        for name, partner_name, start, end in data["partnerships"]:
+            family_tree._index_partnership(cls._partnership_key(name, partner_name, parse_date(start)),
+                                           parse_date(end))
+        return family_tree
+
     def display_tree(self, root_name):
         """
         Displays the family tree starting from a specific person.
@@ -67,8 +738,8 @@ class FamilyTree:
         Lists all members of the family tree.
         """
         print("Members of the Family Tree:")
-        for name, person in self.members.items():
-            print(f"- {name} ({person.gender})")
+        for person in self.get_members():
+            print(f"- {person.name} ({person.gender})")
 
     def get_average_age_at_death(self):
         """
@@ -85,7 +756,7 @@ class FamilyTree:
         total_age = 0
         count = 0
 
-        for person in self.members.values():
+        for person in self.get_members():
             if isinstance(person, DeceasedPerson):
                 age = person.get_age_at_death()
                 if age is not None:
@@ -105,7 +776,7 @@ class FamilyTree:
         #Fran has contributed to this method
 
         total_children = 0
-        for person in self.members.values():
+        for person in self.get_members():
             total_children += len(person.children)
         return total_children
 
@@ -125,6 +796,164 @@ class FamilyTree:
         total_members = len(self.members)
         return total_children / total_members if total_members > 0 else None
 
+    def get_grouped_statistics(self, group_by="gender", quantiles=(0.25, 0.5, 0.75), bin_width=10):
+        """
+        Calculates lifespan, children per person and age at first child for groups of members,
+        in a single pass over the family tree.
+
+        Args:
+            group_by (str or callable, optional): "gender", "birth_decade", "generation", "branch",
+                or a function returning the group of a person. Defaults to "gender".
+                Generation 0 is people with no parents in the tree, and people recorded as their
+                own ancestor are grouped under None with their descendants. A branch is the sibling
+                group at the top of a person's paternal line (maternal if no father is known),
+                including siblings of siblings, named after its first member alphabetically.
+            quantiles (tuple[float], optional): Quantiles to report. Defaults to the quartiles.
+            bin_width (int, optional): Width in years of the lifespan and age histograms. Defaults to 10.
+
+        Returns:
+            dict: Group -> {"count": number of people, "lifespan": ..., "children": ...,
+            "age_at_first_child": ...}, where each statistic has a "count", "mean", "quantiles"
+            and "histogram". People whose group is unknown are grouped under None.
+
+        Raises:
+            ValueError: If group_by is not a known grouping.
+        """
+        members = self.get_members()
+        if callable(group_by):
+            get_group = group_by
+        elif group_by == "gender":
+            get_group = lambda person: person.gender
+        elif group_by == "birth_decade":
+            get_group = self._get_birth_decade
+        elif group_by == "generation":
+            get_group = self._get_generations(members).get
+        elif group_by == "branch":
+            get_group = self._get_branches(members).get
+        else:
+            raise ValueError(f"Unknown grouping: {group_by}")
+
+        groups = {}
+        for person in members:
+            group = groups.setdefault(get_group(person), {
+                "count": 0,
+                "lifespan": ValueSketch(),
+                "children": ValueSketch(),
+                "age_at_first_child": ValueSketch(),
+            })
+            group["count"] += 1
+            group["children"].add(len(person.children))
+            if isinstance(person, DeceasedPerson):
+                age = person.get_age_at_death()
+                if age is not None:
+                    group["lifespan"].add(age)
+            birth = parse_date(person.birth_date)
+            if birth is not None:
+                child_births = [parse_date(child.birth_date) for child in person.children]
+                child_years = [child_birth.year for child_birth in child_births if child_birth is not None]
+                if child_years:
+                    group["age_at_first_child"].add(min(child_years) - birth.year)
+
+        try:
+            order = sorted(groups, key=lambda key: (key is None, key))
+        except TypeError:
+            order = list(groups)
+        return {
+            key: {
+                "count": groups[key]["count"],
+                "lifespan": groups[key]["lifespan"].summary(quantiles, bin_width),
+                "children": groups[key]["children"].summary(quantiles, 1),
+                "age_at_first_child": groups[key]["age_at_first_child"].summary(quantiles, bin_width),
+            }
+            for key in order
+        }
+
+    @staticmethod
+    def _get_birth_decade(person):
+        """
+        Returns:
+            int or None: The decade the person was born in, e.g. 1970.
+        """
+        birth = parse_date(person.birth_date)
+        return birth.year // 10 * 10 if birth else None
+
+    def _get_generations(self, members):
+        """
+        Numbers the generations of the given members, counting down from people with no parents in the tree.
+
+        Returns:
+            dict: Person -> generation number, or None for people who are their own ancestor
+            and for their descendants.
+        """
+        generations = {}
+        in_progress = set()  # People whose parents are still being numbered
+        for person in members:
+            stack = [person]
+            while stack:
+                current = stack[-1]
+                if current in generations:
+                    stack.pop()
+                    continue
+                parents = [parent for parent in self._get_parents(current) if self.members.get(parent.name) is parent]
+                pending = [parent for parent in parents if parent not in generations and parent not in in_progress]
+                if pending:
+                    in_progress.add(current)
+                    stack.extend(pending)
+                    continue
+                in_progress.discard(current)
+                # A parent that is still in progress is also a descendant, so the parents form a cycle
+                if any(generations.get(parent) is None for parent in parents):
+                    generations[current] = None
+                else:
+                    generations[current] = 1 + max((generations[parent] for parent in parents), default=-1)
+                stack.pop()
+        return generations
+
+    @staticmethod
+    def _get_parents(person):
+        """
+        Returns:
+            list[Person]: Everyone recorded as a parent of the person.
+        """
+        parents = list(person.parents)
+        for parent in (person.mum, person.dad):
+            if parent is not None and parent not in parents:
+                parents.append(parent)
+        return parents
+
+    def _get_branches(self, members):
+        """
+        Finds the branch of each of the given members (see get_grouped_statistics).
+
+        Returns:
+            dict: Person -> branch name.
+        """
+        group_names = {}  # Dictionary of person -> name of their connected sibling group
+        branches = {}
+        for person in members:
+            ancestor = person
+            seen = {ancestor}
+            while True:
+                parent = ancestor.dad or ancestor.mum
+                if parent is None or parent in seen:
+                    break
+                ancestor = parent
+                seen.add(ancestor)
+
+            if ancestor not in group_names:
+                group = [ancestor]
+                found = {ancestor}
+                for member in group:
+                    for sibling in member.siblings:
+                        if sibling not in found:
+                            found.add(sibling)
+                            group.append(sibling)
+                name = min(member.name for member in group)
+                for member in group:
+                    group_names[member] = name
+            branches[person] = group_names[ancestor]
+        return branches
+
 class Child(Person):
     """
     Represents a child in the family tree, extending Person.
@@ -190,11 +1019,10 @@ class BirthdayManager:
             was discussed with ChatGPT to ensure proper handling of edge cases (e.g., invalid or missing dates).
         """
         upcoming_birthdays = []
-        for person in self.family_tree.members.values():
-            if person.birth_date:
-                birth_month = int(person.birth_date.split("/")[1])  # Extract month from DD/MM/YYYY
-                if birth_month == month:
-                    upcoming_birthdays.append(person)
+        for person in self.family_tree.get_members():
+            birth = parse_date(person.birth_date)  # Accepts DD/MM/YYYY and YYYY-MM-DD
+            if birth is not None and birth.month == month:
+                upcoming_birthdays.append(person)
         return upcoming_birthdays
 
     def display_upcoming_birthdays(self, month):
@@ -212,3 +1040,13 @@ class BirthdayManager:
         print(f"Upcoming Birthdays in Month {month}:")
         for person in people_with_birthdays:
             print(f"- {person.name} ({person.birth_date})")
+
+
+# Person classes that can be saved and loaded, and the extra details some of them carry
+PERSON_TYPES = {
+    "Person": Person,
+    "Parent": Parent,
+    "DeceasedPerson": DeceasedPerson,
+    "Child": Child,
+}
+PERSON_EXTRA_FIELDS = ("death_date", "grade")
@@ -0,0 +1,138 @@
+import copy
+import unicodedata
+
+from Person import RelativeList
+from Timeline import parse_date
+
+
+def normalize_name(name):
+    """
+    Normalizes a name for comparison by removing accents, case, and extra whitespace.
+
+    Args:
+        name (str): The name to normalize.
+
+    Returns:
+        str: The normalized name, e.g. "  María " becomes "maria".
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def blocking_key(person):
+    """
+    Builds the key used to group possible duplicates: normalized name plus birth year.
+
+    Args:
+        person (Person): The person to build the key for.
+
+    Returns:
+        tuple: (normalized name, birth year or None).
+    """
+    birth = parse_date(person.birth_date)
+    return normalize_name(person.name), birth.year if birth else None
+
+
+def copy_person(person):
+    """
+    Creates a copy of a person with the same details but no relationships.
+
+    Args:
+        person (Person): The person to copy.
+
+    Returns:
+        Person: A new object of the same class with empty relationships.
+    """
+    duplicate = copy.copy(person)
+    duplicate.children = RelativeList()
+    duplicate.partner = None
+    duplicate.last_partners = RelativeList()
+    duplicate.mum = None
+    duplicate.dad = None
+    duplicate.siblings = RelativeList()
+    duplicate.parents = RelativeList()
+    duplicate.past_partner_of = RelativeList()
+    return duplicate
+
+
+class DuplicateDetector:
+    """
+    Finds people in a family tree that are likely to be the same as a given person.
+
+    Only people sharing a blocking key (normalized name and birth year) are compared,
+    so matching a whole tree stays close to linear instead of comparing all pairs.
+    """
+
+    def __init__(self, family_tree):
+        """
+        Initializes the detector by grouping the tree's members into blocks.
+
+        Args:
+            family_tree (FamilyTree): The tree to search for duplicates.
+        """
+        self.blocks = {}  # Dictionary of blocking key -> list of members
+        for person in family_tree.get_members():
+            self.blocks.setdefault(blocking_key(person), []).append(person)
+
+    def find_matches(self, person):
+        """
+        Scores every candidate that shares the person's blocking key.
+
+        Args:
+            person (Person): The person to look for, usually from another tree.
+
+        Returns:
+            list[tuple[Person, float]]: Candidates and scores, best match first.
+        """
+        matches = [(candidate, self.score(person, candidate))
+                   for candidate in self.blocks.get(blocking_key(person), [])]
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    @staticmethod
+    def score(person, candidate):
+        """
+        Scores how well two people's details and relatives agree.
+
+        The full birth date and death date are compared wherever both people have them
+        recorded, and so are the parents, partner and children, by normalized name. The score
+        is the share of those comparisons that agree, or 0.5 when there is nothing to compare.
+        People of different recorded genders always score 0.
+
+        Args:
+            person (Person): The first person.
+            candidate (Person): The second person.
+
+        Returns:
+            float: A score between 0 and 1.
+        """
+        if person.gender and candidate.gender and person.gender != candidate.gender:
+            return 0.0
+
+        agreement = 0.0
+        compared = 0
+        for field in ("birth_date", "death_date"):
+            first = parse_date(getattr(person, field, None))
+            second = parse_date(getattr(candidate, field, None))
+            if first is not None and second is not None:
+                compared += 1
+                if first == second:
+                    agreement += 1
+
+        for relation in ("mum", "dad", "partner"):
+            first = getattr(person, relation)
+            second = getattr(candidate, relation)
+            if first is not None and second is not None:
+                compared += 1
+                if normalize_name(first.name) == normalize_name(second.name):
+                    agreement += 1
+
+        if person.children and candidate.children:
+            first_children = {normalize_name(child.name) for child in person.children}
+            second_children = {normalize_name(child.name) for child in candidate.children}
+            compared += 1
+            # Either record may be missing children, so only the smaller list needs to be covered
+            agreement += len(first_children & second_children) / min(len(first_children), len(second_children))
+
+        return agreement / compared if compared else 0.5
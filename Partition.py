@@ -0,0 +1,397 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from Timeline import parse_date
+
+
+def _depth_first(start, members):
+    """
+    Lists the members reachable from a person, in depth-first order, so that each
+    sub-branch forms a contiguous run.
+    """
+    order = []
+    seen = {start.name}
+    stack = [start]
+    while stack:
+        person = stack.pop()
+        order.append(person)
+        for relative in reversed(person.get_relatives()):
+            if relative.name not in seen and members.get(relative.name) is relative:
+                seen.add(relative.name)
+                stack.append(relative)
+    return order
+
+
+class Shard:
+    """
+    Part of a family tree that can be sent to another process.
+
+    Members are stored as plain records that refer to relatives by name. Relatives that
+    live in a different shard are kept as stubs mapping their name to that shard's index.
+    """
+
+    def __init__(self, index):
+        """
+        Initializes an empty shard.
+
+        Args:
+            index (int): Position of the shard in the partition.
+        """
+        self.index = index
+        self.members = {}  # Dictionary of name -> member record
+        self.stubs = {}  # Dictionary of name -> index of the shard holding that person
+
+    def add_member(self, person):
+        """
+        Stores a person as a record of their details and the names of their relatives.
+
+        Args:
+            person (Person): The person to store.
+        """
+        age_at_death = person.get_age_at_death() if hasattr(person, "get_age_at_death") else None
+        self.members[person.name] = {
+            "name": person.name,
+            "gender": person.gender,
+            "birth_date": person.birth_date,
+            "age_at_death": age_at_death,
+            "children": [child.name for child in person.children],
+            "siblings": [sibling.name for sibling in person.siblings],
+            "partner": person.partner.name if person.partner else None,
+            "mum": person.mum.name if person.mum else None,
+            "dad": person.dad.name if person.dad else None,
+        }
+
+
+def partition_tree(family_tree, shard_count, balance=1.1, refinement_passes=4):
+    """
+    Splits a family tree into shards along family branches.
+
+    Members are ordered by a depth-first walk over their relationships, starting from
+    the edge of each connected family so that each branch stays together, and the order
+    is cut into equally sized shards. Refinement passes then move people to the shard
+    holding most of their relatives whenever that cuts fewer relationships and the shard
+    is not full.
+
+    Args:
+        family_tree (FamilyTree): The tree to split.
+        shard_count (int): Number of shards to create.
+        balance (float, optional): Largest allowed shard size relative to an even split. Defaults to 1.1.
+        refinement_passes (int, optional): Maximum number of refinement passes. Defaults to 4.
+
+    Returns:
+        list[Shard]: The shards, including stubs for relatives held by other shards.
+
+    Raises:
+        ValueError: If shard_count is less than 1.
+    """
+    if shard_count < 1:
+        raise ValueError("shard_count must be at least 1.")
+    members = {person.name: person for person in family_tree.get_members()}
+
+    order = []
+    visited = set()
+    for name in members:
+        if name in visited:
+            continue
+        # Restart from the last person reached, so the walk runs from one end of the branch to the other
+        component = _depth_first(members[name], members)
+        component = _depth_first(component[-1], members)
+        visited.update(person.name for person in component)
+        order.extend(component)
+
+    chunk = math.ceil(len(order) / shard_count) if order else 1
+    assignment = {person.name: position // chunk for position, person in enumerate(order)}
+    sizes = [0] * shard_count
+    for shard_index in assignment.values():
+        sizes[shard_index] += 1
+
+    capacity = max(chunk, math.floor(len(order) / shard_count * balance))
+    for _ in range(refinement_passes):
+        moved = False
+        for person in order:
+            current = assignment[person.name]
+            counts = {}
+            for relative in person.get_relatives():
+                if relative.name in assignment:
+                    shard_index = assignment[relative.name]
+                    counts[shard_index] = counts.get(shard_index, 0) + 1
+            if not counts:
+                continue
+            best = max(counts, key=counts.get)
+            if best != current and counts[best] > counts.get(current, 0) and sizes[best] < capacity:
+                assignment[person.name] = best
+                sizes[current] -= 1
+                sizes[best] += 1
+                moved = True
+        if not moved:
+            break
+
+    shards = [Shard(index) for index in range(shard_count)]
+    for person in order:
+        shard = shards[assignment[person.name]]
+        shard.add_member(person)
+        for relative in person.get_relatives():
+            relative_shard = assignment.get(relative.name)
+            if relative_shard is not None and relative_shard != shard.index:
+                shard.stubs[relative.name] = relative_shard
+    return shards
+
+
+def count_cut_edges(family_tree, shards):
+    """
+    Counts the relationships that cross from one shard to another.
+
+    Args:
+        family_tree (FamilyTree): The tree the shards were built from.
+        shards (list[Shard]): The shards to check.
+
+    Returns:
+        int: Number of related pairs of people held by different shards.
+    """
+    assignment = {name: shard.index for shard in shards for name in shard.members}
+    cut = set()
+    for person in family_tree.get_members():
+        for relative in person.get_relatives():
+            if relative.name in assignment and assignment[relative.name] != assignment[person.name]:
+                cut.add(frozenset((person.name, relative.name)))
+    return len(cut)
+
+
+def shard_statistics(shard):
+    """
+    Collects the totals needed for the tree-wide statistics from one shard.
+
+    Returns:
+        dict: Member count, number of children, and age-at-death total and count.
+    """
+    totals = {"members": len(shard.members), "children": 0, "age_at_death_total": 0, "deceased": 0}
+    for record in shard.members.values():
+        totals["children"] += len(record["children"])
+        if record["age_at_death"] is not None:
+            totals["age_at_death_total"] += record["age_at_death"]
+            totals["deceased"] += 1
+    return totals
+
+
+def shard_birthdays(shard, month):
+    """
+    Finds the members of one shard with a birthday in a given month.
+
+    Returns:
+        list[str]: Names of the members born in that month.
+    """
+    names = []
+    for record in shard.members.values():
+        birth = parse_date(record["birth_date"])
+        if birth is not None and birth.month == month:
+            names.append(record["name"])
+    return names
+
+
+def shard_descendants(shard):
+    """
+    Finds each member's descendants within one shard, and the children in other shards
+    where their line of descent leaves the shard.
+
+    People recorded as their own ancestor are not counted among their own descendants.
+
+    Returns:
+        dict: Name -> (set of local descendant names, set of stub names).
+    """
+    results = {}
+    in_progress = set()  # Members whose children are still being visited
+    incomplete = set()  # Members whose descendants include a cycle, found by a full search instead
+    for name in shard.members:
+        stack = [name]
+        while stack:
+            current = stack[-1]
+            if current in results:
+                stack.pop()
+                continue
+            children = shard.members[current]["children"]
+            pending = [child for child in children
+                       if child in shard.members and child not in results and child not in in_progress]
+            if pending:
+                in_progress.add(current)
+                stack.extend(pending)
+                continue
+            in_progress.discard(current)
+            local, exits = set(), set()
+            for child in children:
+                if child in shard.members:
+                    local.add(child)
+                    if child in results:
+                        local |= results[child][0]
+                        exits |= results[child][1]
+                    if child not in results or child in incomplete:
+                        # A child still in progress is also an ancestor, so the parents form a cycle
+                        incomplete.add(current)
+                elif child in shard.stubs:
+                    exits.add(child)
+            results[current] = (local, exits)
+            stack.pop()
+
+    for name in incomplete:
+        local, exits = set(), set()
+        stack = [name]
+        while stack:
+            for child in shard.members[stack.pop()]["children"]:
+                if child in shard.members:
+                    if child not in local:
+                        local.add(child)
+                        stack.append(child)
+                elif child in shard.stubs:
+                    exits.add(child)
+        local.discard(name)
+        results[name] = (local, exits)
+    return results
+
+
+# Shards held by the current worker process, set once when the worker starts
+_worker_shards = []
+
+
+def _load_shards(shards):
+    """
+    Stores a worker's shards, so that later queries only send the function to run.
+    """
+    _worker_shards[:] = shards
+
+
+def _run_on_shards(function, *args):
+    """
+    Runs a shard function on each of the current worker's shards.
+
+    Returns:
+        list: One result per shard, in the order the shards were given to the worker.
+    """
+    return [function(shard, *args) for shard in _worker_shards]
+
+
+class ShardCoordinator:
+    """
+    Runs queries on every shard in worker processes and combines the results.
+
+    Each worker is sent its shards once, when it starts, and afterwards only receives
+    the query to run, so repeated queries do not copy the tree again.
+    """
+
+    def __init__(self, shards, max_workers=None):
+        """
+        Initializes the coordinator.
+
+        Args:
+            shards (list[Shard]): The shards to query, as returned by partition_tree.
+            max_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        """
+        self.shards = shards
+        worker_count = max(1, min(max_workers or os.cpu_count() or 1, len(shards)))
+        self.assignments = [shards[index::worker_count] for index in range(worker_count)]
+        self.executors = [ProcessPoolExecutor(max_workers=1, initializer=_load_shards, initargs=(assigned,))
+                          for assigned in self.assignments]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Shuts down the worker processes.
+        """
+        for executor in self.executors:
+            executor.shutdown()
+
+    def _map(self, function, *args):
+        """
+        Runs a shard function on every shard, passing the same extra arguments to each.
+        """
+        futures = [executor.submit(_run_on_shards, function, *args) for executor in self.executors]
+        return [result for future in futures for result in future.result()]
+
+    def get_statistics(self):
+        """
+        Calculates the same statistics as FamilyTree for the whole partitioned tree.
+
+        Returns:
+            dict: "average_age_at_death", "total_children" and "average_children".
+        """
+        totals = {"members": 0, "children": 0, "age_at_death_total": 0, "deceased": 0}
+        for shard_totals in self._map(shard_statistics):
+            for key, value in shard_totals.items():
+                totals[key] += value
+        return {
+            "average_age_at_death": totals["age_at_death_total"] / totals["deceased"] if totals["deceased"] else None,
+            "total_children": totals["children"],
+            "average_children": totals["children"] / totals["members"] if totals["members"] else None,
+        }
+
+    def get_upcoming_birthdays(self, month):
+        """
+        Retrieves the names of everyone with a birthday in a given month.
+
+        Args:
+            month (int): The month (1-12) to check for birthdays.
+
+        Returns:
+            list[str]: Names of the people born in that month.
+        """
+        return [name for names in self._map(shard_birthdays, month) for name in names]
+
+    def get_descendant_counts(self):
+        """
+        Counts every person's descendants, following lines of descent across shards.
+        People recorded as their own ancestor are counted once, and not among their own descendants.
+
+        Returns:
+            dict: Name -> number of descendants.
+        """
+        partial = {}
+        for shard_results in self._map(shard_descendants):
+            partial.update(shard_results)
+
+        descendants = {}
+        in_progress = set()  # People whose stubs are still being resolved
+        incomplete = set()  # People whose line of descent loops back across shards
+        for name in partial:
+            # Resolve stubs before the people that lead to them, without recursion
+            stack = [name]
+            while stack:
+                current = stack[-1]
+                if current in descendants:
+                    stack.pop()
+                    continue
+                pending = [stub for stub in partial[current][1] if stub not in descendants and stub not in in_progress]
+                if pending:
+                    in_progress.add(current)
+                    stack.extend(pending)
+                    continue
+                in_progress.discard(current)
+                local, exits = partial[current]
+                combined = set(local)
+                for stub in exits:
+                    combined.add(stub)
+                    if stub in descendants:
+                        combined |= descendants[stub]
+                    if stub not in descendants or stub in incomplete:
+                        incomplete.add(current)
+                descendants[current] = combined
+                stack.pop()
+
+        for name in incomplete:
+            # Follow every stub again, visiting each person once
+            local, exits = partial[name]
+            combined = set(local) | exits
+            stack = list(exits)
+            while stack:
+                stub_local, stub_exits = partial[stack.pop()]
+                combined |= stub_local
+                for stub in stub_exits:
+                    if stub not in combined:
+                        combined.add(stub)
+                        stack.append(stub)
+            combined.discard(name)
+            descendants[name] = combined
+        return {name: len(names) for name, names in descendants.items()}
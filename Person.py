@@ -1,5 +1,76 @@
 # Francisco has developed this part
 
+class RelativeList:
+    """
+    An ordered list of relatives that finds and removes a person in constant time.
+
+    It behaves like the plain lists it replaces: it keeps the order people were added in,
+    can hold the same person more than once, and compares equal to a list with the same items.
+    """
+
+    def __init__(self, people=()):
+        """
+        Initializes the list, optionally with some people.
+
+        Args:
+            people (iterable[Person], optional): People to add, in order. Defaults to none.
+        """
+        self._counts = {}  # Dictionary of person -> number of times they are listed, in insertion order
+        self._length = 0
+        for person in people:
+            self.append(person)
+
+    def append(self, person):
+        """
+        Adds a person to the end of the list.
+        """
+        self._counts[person] = self._counts.get(person, 0) + 1
+        self._length += 1
+
+    def remove(self, person):
+        """
+        Removes one occurrence of a person.
+
+        Raises:
+            ValueError: If the person is not in the list.
+        """
+        count = self._counts.get(person)
+        if count is None:
+            raise ValueError("list.remove(x): x not in list")
+        if count == 1:
+            del self._counts[person]
+        else:
+            self._counts[person] = count - 1
+        self._length -= 1
+
+    def count(self, person):
+        """
+        Returns:
+            int: Number of times the person is listed.
+        """
+        return self._counts.get(person, 0)
+
+    def __contains__(self, person):
+        return person in self._counts
+
+    def __iter__(self):
+        # Iterates over a copy, so the list can change while it is being read
+        for person, count in list(self._counts.items()):
+            for _ in range(count):
+                yield person
+
+    def __len__(self):
+        return self._length
+
+    def __eq__(self, other):
+        if isinstance(other, (list, RelativeList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+
 class Person:
     """
     Represents an individual in a family tree.
@@ -18,12 +89,14 @@ class Person:
         self.name = name
         self.gender = gender
         self.birth_date = birth_date
-        self.children = []  # Stores child objects related to this person
+        self.children = RelativeList()  # Stores child objects related to this person
         self.partner = None  # Current partner
-        self.last_partners = []  # List of past partners for tracking relationships
+        self.last_partners = RelativeList()  # List of past partners for tracking relationships
         self.mum = None  # Reference to mother, if known
         self.dad = None  # Reference to father, if known
-        self.siblings = []  # List of sibling objects
+        self.siblings = RelativeList()  # List of sibling objects
+        self.parents = RelativeList()  # Reverse index: people who list this person in their children
+        self.past_partner_of = RelativeList()  # Reverse index: people who list this person in their last_partners
 
     def add_child(self, child):
         """
@@ -38,6 +111,7 @@ class Person:
         if not isinstance(child, Person):
             raise ValueError("Child must be a Person object.")
         self.children.append(child)
+        child.parents.append(self)
         # Automatically link the parent to the child
         if self.gender == "Male":
             child.dad = self
@@ -61,6 +135,7 @@ class Person:
         if self.partner is not None:
             if self.partner not in self.last_partners:
                 self.last_partners.append(self.partner)
+                self.partner.past_partner_of.append(self)
             # Break the reciprocal relationship
             if self.partner.partner == self:
                 self.partner.partner = None
@@ -87,6 +162,128 @@ class Person:
             self.siblings.append(sibling)
             sibling.siblings.append(self)
 
+    def unlink_child(self, child):
+        """
+        Removes a child from the person and clears the child's reference back to this parent.
+
+        Args:
+            child (Person): The child to unlink.
+
+        Raises:
+            ValueError: If the child is not one of this person's children.
+        """
+        if child not in self.children:
+            raise ValueError(f"{child.name} is not a child of {self.name}.")
+        self.children.remove(child)
+        child.parents.remove(self)
+        # Only clear the parent reference once no other link to this parent remains
+        if self not in child.parents:
+            if child.dad is self:
+                child.dad = None
+            if child.mum is self:
+                child.mum = None
+
+    def unlink_sibling(self, sibling):
+        """
+        Removes a mutual sibling relationship.
+
+        Args:
+            sibling (Person): The sibling to unlink.
+
+        Raises:
+            ValueError: If the provided person is not a sibling.
+        """
+        if sibling not in self.siblings:
+            raise ValueError(f"{sibling.name} is not a sibling of {self.name}.")
+        self.siblings.remove(sibling)
+        if self in sibling.siblings:
+            sibling.siblings.remove(self)
+
+    def end_partnership(self):
+        """
+        Ends the current partnership on both sides, moving each partner to the other's past partners.
+
+        Raises:
+            ValueError: If the person has no current partner.
+        """
+        partner = self.partner
+        if partner is None:
+            raise ValueError(f"{self.name} has no current partner.")
+        self.partner = None
+        if partner.partner is self:
+            partner.partner = None
+        self.add_past_partner(partner)
+
+    def add_past_partner(self, partner):
+        """
+        Records a mutual past partnership without changing either current partner.
+
+        Args:
+            partner (Person): The past partner to record.
+
+        Raises:
+            ValueError: If the provided partner is not a Person object.
+        """
+        if not isinstance(partner, Person):
+            raise ValueError("Partner must be a Person object.")
+        if partner not in self.last_partners:
+            self.last_partners.append(partner)
+            partner.past_partner_of.append(self)
+        if self not in partner.last_partners:
+            partner.last_partners.append(self)
+            self.past_partner_of.append(partner)
+
+    def detach(self):
+        """
+        Removes every relationship pointing to or from this person, in time proportional
+        to the number of relationships they have, however many relatives those relatives have.
+        """
+        # Each link is visited once, removed from the other side in constant time, and the
+        # person's own lists are cleared at the end
+        for child in self.children:
+            child.parents.remove(self)
+            if child.dad is self:
+                child.dad = None
+            if child.mum is self:
+                child.mum = None
+        for parent in self.parents:
+            parent.children.remove(self)
+        for sibling in self.siblings:
+            sibling.siblings.remove(self)
+        self.children = RelativeList()
+        self.parents = RelativeList()
+        self.siblings = RelativeList()
+
+        if self.partner is not None:
+            if self.partner.partner is self:
+                self.partner.partner = None
+            self.partner = None
+        for past_partner in self.last_partners:
+            past_partner.past_partner_of.remove(self)
+        for other in self.past_partner_of:
+            other.last_partners.remove(self)
+        self.last_partners = RelativeList()
+        self.past_partner_of = RelativeList()
+
+        # References set directly rather than through add_child
+        self.mum = None
+        self.dad = None
+
+    def get_relatives(self):
+        """
+        Retrieves everyone directly related to the person.
+
+        Returns:
+            list[Person]: Parents, children, siblings, and current and past partners, without repeats.
+        """
+        relatives = {}
+        for group in (self.parents, self.children, self.siblings, self.last_partners,
+                      self.past_partner_of, (self.mum, self.dad, self.partner)):
+            for relative in group:
+                if relative is not None:
+                    relatives[id(relative)] = relative
+        return list(relatives.values())
+
     def get_past_partners(self):
         """
         Retrieves the names of past partners.
@@ -0,0 +1,117 @@
+import math
+from collections import Counter
+
+
+class ValueSketch:
+    """
+    Summarizes whole-number values (ages, numbers of children) for grouped statistics.
+
+    Values are kept as a count per distinct value, so the memory used depends on the
+    range of values rather than on how many people were added, while means, quantiles
+    and histograms remain exact.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty sketch.
+        """
+        self.counts = Counter()
+        self.count = 0
+        self.total = 0
+
+    def add(self, value):
+        """
+        Adds a value to the sketch.
+
+        Args:
+            value (int): The value to add.
+        """
+        self.counts[value] += 1
+        self.count += 1
+        self.total += value
+
+    def mean(self):
+        """
+        Returns:
+            float or None: The mean value, or None if the sketch is empty.
+        """
+        return self.total / self.count if self.count else None
+
+    def quantile(self, fraction):
+        """
+        Finds the value below which the given fraction of values fall (nearest rank).
+
+        Args:
+            fraction (float): A number between 0 and 1, e.g. 0.5 for the median.
+
+        Returns:
+            int or None: The quantile, or None if the sketch is empty.
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen >= rank:
+                return value
+        return None
+
+    def histogram(self, bin_width):
+        """
+        Groups the values into bins of equal width.
+
+        Args:
+            bin_width (int): Width of each bin.
+
+        Returns:
+            dict: Start of each bin -> number of values in it, in ascending order.
+        """
+        bins = Counter()
+        for value, count in self.counts.items():
+            bins[value // bin_width * bin_width] += count
+        return dict(sorted(bins.items()))
+
+    def summary(self, quantiles, bin_width):
+        """
+        Builds the summary reported for one statistic of one group.
+
+        Returns:
+            dict: "count", "mean", "quantiles" (fraction -> value) and "histogram".
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "quantiles": {fraction: self.quantile(fraction) for fraction in quantiles},
+            "histogram": self.histogram(bin_width),
+        }
+
+
+def format_table(statistics):
+    """
+    Formats grouped statistics as a text table with the mean and median of each statistic.
+
+    Args:
+        statistics (dict): The result of FamilyTree.get_grouped_statistics().
+
+    Returns:
+        str: One line per group.
+    """
+    def describe(summary):
+        if not summary["count"]:
+            return "-"
+        median = summary["quantiles"].get(0.5)
+        text = f"{summary['mean']:.1f}"
+        return text + f" / {median}" if median is not None else text
+
+    rows = [("Group", "People", "Lifespan", "Children", "Age at first child")]
+    for group, values in statistics.items():
+        rows.append((
+            "Unknown" if group is None else str(group),
+            str(values["count"]),
+            describe(values["lifespan"]),
+            describe(values["children"]),
+            describe(values["age_at_first_child"]),
+        ))
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in rows)
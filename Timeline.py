@@ -0,0 +1,167 @@
+import math
+from datetime import date, datetime
+
+
+def parse_date(value):
+    """
+    Converts a date string from the family tree into a date object.
+
+    Args:
+        value (str or date): A date in 'DD/MM/YYYY' or 'YYYY-MM-DD' format, or a date object.
+
+    Returns:
+        date or None: The parsed date, or None if the value is missing or invalid.
+    """
+    if value is None:
+        return None
+    if isinstance(value, date):
+        return value
+    for date_format in ("%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, date_format).date()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class IntervalIndex:
+    """
+    Stores closed date intervals by key and answers "which intervals contain this date" queries.
+
+    The intervals are kept in a centered interval tree. Changes made since the tree was
+    built are kept aside and checked one by one, and the tree is only rebuilt once there
+    are more than about 4 * sqrt(n) of them. A query therefore costs O(log n + k + sqrt(n))
+    for k matching intervals, and each change costs O(sqrt(n) log n) amortized.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty interval index.
+        """
+        self.intervals = {}  # Dictionary of key -> (start, end)
+        self._root = None
+        self._built = set()  # Keys stored in the tree
+        self._added = {}  # Intervals added or replaced since the tree was built
+        self._removed = set()  # Keys in the tree whose interval was removed or replaced
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def add(self, key, start, end=None):
+        """
+        Adds or replaces the interval stored under a key.
+
+        Args:
+            key: Identifier returned by queries.
+            start (date): First day of the interval.
+            end (date, optional): Last day of the interval. Defaults to None for an open interval.
+
+        Raises:
+            ValueError: If the interval ends before it starts.
+        """
+        if end is None:
+            end = date.max
+        if end < start:
+            raise ValueError("An interval cannot end before it starts.")
+        self.intervals[key] = (start, end)
+        self._added[key] = (start, end)
+        if key in self._built:
+            self._removed.add(key)
+
+    def remove(self, key):
+        """
+        Removes the interval stored under a key, if any.
+
+        Args:
+            key: Identifier of the interval to remove.
+        """
+        if self.intervals.pop(key, None) is not None:
+            self._added.pop(key, None)
+            if key in self._built:
+                self._removed.add(key)
+
+    def get(self, key):
+        """
+        Retrieves the interval stored under a key.
+
+        Returns:
+            tuple[date, date] or None: The (start, end) pair, or None if the key is unknown.
+        """
+        return self.intervals.get(key)
+
+    def stab(self, point):
+        """
+        Finds every interval containing a given date.
+
+        Args:
+            point (date): The date to look up.
+
+        Returns:
+            list: Keys of the intervals containing the date.
+        """
+        if len(self._added) + len(self._removed) > max(64, 4 * math.isqrt(len(self.intervals))):
+            items = [(start, end, key) for key, (start, end) in self.intervals.items()]
+            self._root = _IntervalNode.build(items)
+            self._built = set(self.intervals)
+            self._added = {}
+            self._removed = set()
+
+        found = []
+        node = self._root
+        while node is not None:
+            if point < node.center:
+                for start, end, key in node.by_start:
+                    if start > point:
+                        break
+                    found.append(key)
+                node = node.left
+            elif point > node.center:
+                for start, end, key in node.by_end:
+                    if end < point:
+                        break
+                    found.append(key)
+                node = node.right
+            else:
+                found.extend(key for start, end, key in node.by_start)
+                node = None
+
+        if self._removed:
+            found = [key for key in found if key not in self._removed]
+        found.extend(key for key, (start, end) in self._added.items() if start <= point <= end)
+        return found
+
+
+class _IntervalNode:
+    """
+    A node of the centered interval tree used by IntervalIndex.
+    """
+
+    def __init__(self, center, overlapping, left, right):
+        self.center = center
+        self.by_start = sorted(overlapping, key=lambda item: item[0])
+        self.by_end = sorted(overlapping, key=lambda item: item[1], reverse=True)
+        self.left = left
+        self.right = right
+
+    @classmethod
+    def build(cls, items):
+        """
+        Builds a subtree from (start, end, key) triples.
+
+        Returns:
+            _IntervalNode or None: The root of the subtree, or None if there are no items.
+        """
+        if not items:
+            return None
+        endpoints = sorted(point for start, end, key in items for point in (start, end))
+        center = endpoints[len(endpoints) // 2]
+
+        left, right, overlapping = [], [], []
+        for item in items:
+            if item[1] < center:
+                left.append(item)
+            elif item[0] > center:
+                right.append(item)
+            else:
+                overlapping.append(item)
+        return cls(center, overlapping, cls.build(left), cls.build(right))
@@ -0,0 +1,348 @@
+"""
+Command-line entry point for querying a saved family tree.
+
+Examples:
+    python cli.py export demo.json --demo
+    python cli.py query person María --tree demo.json
+    python cli.py load demo.json --serve
+    python cli.py birthdays 5 --connect
+
+Only argparse is imported up front; each subcommand imports the modules it needs,
+so a query against a warm server does not load the family tree code at all.
+
+The server only listens on loopback addresses unless --allow-remote is given. Clients
+must present a shared key: FAMILYTREE_AUTHKEY if it is set, or else a random key the
+server writes to ~/.familytree_authkey (or FAMILYTREE_AUTHKEY_FILE), readable only by
+its owner.
+"""
+
+import argparse
+import os
+import sys
+
+DEFAULT_ADDRESS = "localhost:6000"
+DEFAULT_AUTHKEY_FILE = os.path.join(os.path.expanduser("~"), ".familytree_authkey")
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+REQUEST_TIMEOUT = 30  # Seconds an authenticated client has to send its request
+
+
+def parse_address(address):
+    """
+    Converts a "host:port" string into a listener address. Anything else is used as a socket path.
+
+    Args:
+        address (str): The address to parse.
+
+    Returns:
+        tuple or str: (host, port) or a socket path.
+    """
+    host, separator, port = address.rpartition(":")
+    if separator and port.isdigit():
+        return host, int(port)
+    return address
+
+
+def get_authkey(create=False):
+    """
+    Retrieves the key shared by the server and its clients.
+
+    Args:
+        create (bool, optional): Whether to write a new random key to the key file when
+            FAMILYTREE_AUTHKEY is not set, as the server does. Defaults to False.
+
+    Returns:
+        bytes: The value of FAMILYTREE_AUTHKEY, or the key stored in the key file.
+
+    Raises:
+        ValueError: If there is no key to read.
+    """
+    key = os.environ.get("FAMILYTREE_AUTHKEY")
+    if key:
+        return key.encode()
+
+    path = os.environ.get("FAMILYTREE_AUTHKEY_FILE", DEFAULT_AUTHKEY_FILE)
+    if create:
+        import secrets
+        key = secrets.token_hex(32)
+        descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, "w") as file:
+            os.chmod(path, 0o600)  # The file may already have existed with wider permissions
+            file.write(key)
+        return key.encode()
+    try:
+        with open(path) as file:
+            return file.read().strip().encode()
+    except FileNotFoundError:
+        raise ValueError("No server key found: set FAMILYTREE_AUTHKEY or start a server with 'load --serve'.")
+
+
+def open_tree(options):
+    """
+    Opens the family tree named by the command-line options.
+
+    Args:
+        options (dict): Parsed options containing "tree" or "demo".
+
+    Returns:
+        FamilyTree: The loaded family tree.
+
+    Raises:
+        ValueError: If no tree was specified.
+    """
+    if options.get("demo"):
+        from main import build_demo_tree
+        return build_demo_tree()
+    if options.get("tree"):
+        from FamilyTree import FamilyTree
+        return FamilyTree.load(options["tree"])
+    raise ValueError("Specify a tree with --tree PATH, --demo, or --connect ADDRESS.")
+
+
+def find_person(family_tree, name):
+    """
+    Retrieves a person from the family tree by name.
+
+    Raises:
+        ValueError: If no person with that name exists in the tree.
+    """
+    person = family_tree.get_person(name)
+    if person is None:
+        raise ValueError(f"No person named {name} found in the family tree.")
+    return person
+
+
+def run_command(family_tree, command, options):
+    """
+    Runs a query against a loaded family tree.
+
+    Args:
+        family_tree (FamilyTree): The tree to query.
+        command (str): One of "person", "relatives", "birthdays", "stats" or "export".
+        options (dict): The parsed options for the command.
+
+    Returns:
+        str: The text to print.
+
+    Raises:
+        ValueError: If the command is unknown or names a person not in the tree.
+    """
+    if command == "person":
+        return find_person(family_tree, options["name"]).get_full_details()
+
+    if command == "relatives":
+        person = find_person(family_tree, options["name"])
+        return f"Immediate family: {person.get_immediate_family()}\nExtended family: {person.get_extended_family()}"
+
+    if command == "birthdays":
+        from FamilyTree import BirthdayManager
+        people = BirthdayManager(family_tree).get_upcoming_birthdays(options["month"])
+        if not people:
+            return f"No birthdays found for month {options['month']}."
+        return "\n".join(f"- {person.name} ({person.birth_date})" for person in people)
+
+    if command == "stats" and options.get("group_by"):
+        from Statistics import format_table
+        return format_table(family_tree.get_grouped_statistics(options["group_by"]))
+
+    if command == "stats":
+        average_age = family_tree.get_average_age_at_death()
+        average_children = family_tree.get_average_number_of_children()
+        lines = [
+            f"Members: {len(family_tree.members)}",
+            f"Average Age at Death: {average_age:.2f} years" if average_age is not None
+            else "Average Age at Death: no deceased individuals",
+            f"Total Number of Children: {family_tree.get_total_number_of_children()}",
+            f"Average Number of Children per Person: {average_children:.2f}" if average_children is not None
+            else "Average Number of Children per Person: no members",
+        ]
+        return "\n".join(lines)
+
+    if command == "export":
+        family_tree.save(options["output"])
+        return f"Saved {len(family_tree.members)} members to {options['output']}"
+
+    raise ValueError(f"Unknown command: {command}")
+
+
+def serve(family_tree, address):
+    """
+    Keeps a family tree loaded and answers queries from clients until told to shut down.
+
+    Each request is a (command, options) pair and each reply an (ok, text) pair. Every
+    connection is handled in its own thread, so a client that stalls, whether before or
+    after authenticating, only holds up itself.
+
+    Args:
+        family_tree (FamilyTree): The tree to serve.
+        address (tuple or str): The address to listen on.
+    """
+    import threading
+    from multiprocessing.connection import Listener
+
+    authkey = get_authkey(create=True)
+    stopped = threading.Event()
+    # The key is checked in each connection's thread rather than by accept(), which would
+    # otherwise wait for every client to finish authenticating
+    with Listener(address) as listener:
+        while True:
+            try:
+                connection = listener.accept()
+            except OSError:
+                continue
+            if stopped.is_set():
+                connection.close()
+                return
+            threading.Thread(target=handle_connection, daemon=True,
+                             args=(family_tree, connection, authkey, stopped, listener.address)).start()
+
+
+def handle_connection(family_tree, connection, authkey, stopped, address):
+    """
+    Authenticates one client and answers its request.
+
+    Args:
+        family_tree (FamilyTree): The tree being served.
+        connection (Connection): The accepted connection.
+        authkey (bytes): The key the client must present.
+        stopped (threading.Event): Set once a client asks the server to shut down.
+        address (tuple or str): The server's address, used to wake it up after a shutdown request.
+    """
+    from multiprocessing.connection import AuthenticationError, Client, answer_challenge, deliver_challenge
+
+    with connection:
+        # A client with the wrong key, one that hangs up, or one that sends nothing must not stop the server
+        try:
+            deliver_challenge(connection, authkey)
+            answer_challenge(connection, authkey)
+            if not connection.poll(REQUEST_TIMEOUT):
+                return
+            command, options = connection.recv()
+        except (AuthenticationError, EOFError, OSError, TypeError, ValueError):
+            return
+        if command == "shutdown":
+            reply = (True, "Server stopped.")
+        elif command == "export":
+            # Clients must not be able to make the server write to a path of their choosing
+            reply = (False, "export is not available through a server; use --tree instead.")
+        else:
+            try:
+                reply = (True, run_command(family_tree, command, options))
+            except Exception as error:  # A bad query must not stop the server
+                reply = (False, str(error))
+        try:
+            connection.send(reply)
+        except (EOFError, OSError):
+            pass
+
+    if command == "shutdown":
+        stopped.set()
+        # Connect once more so the accept() waiting in the main thread returns and sees the request
+        Client(address).close()
+
+
+def send_command(address, command, options):
+    """
+    Sends a query to a running server.
+
+    Args:
+        address (tuple or str): The server address.
+        command (str): The command to run.
+        options (dict): The options for the command.
+
+    Returns:
+        tuple[bool, str]: Whether the command succeeded, and its output or error message.
+    """
+    from multiprocessing.connection import Client
+
+    with Client(address, authkey=get_authkey()) as connection:
+        connection.send((command, options))
+        return connection.recv()
+
+
+def build_parser():
+    """
+    Builds the argument parser for all subcommands.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    source = argparse.ArgumentParser(add_help=False)
+    group = source.add_mutually_exclusive_group()
+    group.add_argument("--tree", help="Path of a tree saved as JSON.")
+    group.add_argument("--demo", action="store_true", help="Use the demo tree from main.py.")
+    group.add_argument("--connect", metavar="ADDRESS", nargs="?", const=DEFAULT_ADDRESS,
+                       help=f"Query a server started with 'load --serve' (default {DEFAULT_ADDRESS}).")
+
+    parser = argparse.ArgumentParser(description="Query a saved family tree.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    load = subcommands.add_parser("load", help="Load a saved tree, optionally keeping it loaded as a server.")
+    load.add_argument("tree", help="Path of a tree saved as JSON.")
+    load.add_argument("--serve", metavar="ADDRESS", nargs="?", const=DEFAULT_ADDRESS,
+                      help=f"Listen on HOST:PORT or a socket path (default {DEFAULT_ADDRESS}).")
+    load.add_argument("--allow-remote", action="store_true", help="Allow listening on a non-loopback address.")
+
+    query = subcommands.add_parser("query", help="Look up details.")
+    query_types = query.add_subparsers(dest="query_type", required=True)
+    person = query_types.add_parser("person", parents=[source], help="Show a person's details.")
+    person.add_argument("name")
+
+    relatives = subcommands.add_parser("relatives", parents=[source], help="Show a person's relatives.")
+    relatives.add_argument("name")
+
+    birthdays = subcommands.add_parser("birthdays", parents=[source], help="List birthdays in a month.")
+    birthdays.add_argument("month", type=int, choices=range(1, 13), metavar="MONTH")
+
+    stats = subcommands.add_parser("stats", parents=[source], help="Show tree statistics.")
+    stats.add_argument("--group-by", choices=["gender", "birth_decade", "generation", "branch"],
+                       help="Show lifespan, children and age at first child for each group.")
+
+    export = subcommands.add_parser("export", parents=[source], help="Save the tree as JSON.")
+    export.add_argument("output")
+
+    stop = subcommands.add_parser("stop", help="Stop a server started with 'load --serve'.")
+    stop.add_argument("--connect", metavar="ADDRESS", default=DEFAULT_ADDRESS)
+    return parser
+
+
+def main(argv=None):
+    """
+    Runs the command line.
+
+    Args:
+        argv (list[str], optional): Arguments to parse. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    args = build_parser().parse_args(argv)
+    options = vars(args)
+    command = args.query_type if args.command == "query" else args.command
+
+    try:
+        if command == "load":
+            address = parse_address(args.serve) if args.serve else None
+            if isinstance(address, tuple) and address[0] not in LOOPBACK_HOSTS and not args.allow_remote:
+                raise ValueError(f"Refusing to listen on {args.serve}; use --allow-remote to serve other machines.")
+            family_tree = open_tree(options)
+            print(f"Loaded {len(family_tree.members)} members from {args.tree}")
+            if address is not None:
+                print(f"Serving on {args.serve}", flush=True)
+                serve(family_tree, address)
+            return 0
+
+        if command == "stop":
+            command = "shutdown"
+        if options.get("connect"):
+            ok, output = send_command(parse_address(options["connect"]), command, options)
+        else:
+            ok, output = True, run_command(open_tree(options), command, options)
+    except (ValueError, OSError) as error:
+        ok, output = False, str(error)
+
+    print(output, file=sys.stdout if ok else sys.stderr)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
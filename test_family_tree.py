@@ -1,6 +1,23 @@
+import contextlib
+import io
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
+from collections import Counter
+from datetime import date, timedelta
+from multiprocessing.connection import AuthenticationError, Client
+from unittest import mock
+import cli
 from Person import Person, DeceasedPerson
-from FamilyTree import FamilyTree
+from FamilyTree import FamilyTree, BirthdayManager
+from Partition import partition_tree, count_cut_edges, shard_descendants, Shard, ShardCoordinator
+from Timeline import IntervalIndex
 
 
 class TestFamilyTree(unittest.TestCase):
@@ -161,6 +178,588 @@ class TestFamilyTree(unittest.TestCase):
         empty_tree = FamilyTree()
         self.assertEqual(len(empty_tree.members), 0)
 
+    def test_remove_person(self):
+        """
+        Test that removing a person detaches them from every relationship
+        held by the remaining members.
+        """
+        self.john.set_partner(self.jane)
+        self.lucas.add_sibling(self.emma)
+        self.family_tree.remove_person("John")
+        self.assertNotIn("John", self.family_tree.members)
+        self.assertIsNone(self.jane.partner)
+        self.assertIsNone(self.lucas.dad)
+        self.assertEqual(self.lucas.parents, [])
+        self.assertEqual(self.john.children, [])
+        with self.assertRaises(ValueError):
+            self.family_tree.remove_person("John")
+
+    def test_remove_past_partner(self):
+        """
+        Test that removing a past partner clears them from last_partners.
+        """
+        clara = Person(name="Clara", gender="Female")
+        self.family_tree.add_person(clara)
+        self.john.set_partner(self.jane)
+        self.john.set_partner(clara)
+        self.family_tree.remove_person("Jane")
+        self.assertEqual(self.john.get_past_partners(), [])
+        self.assertEqual(self.john.partner, clara)
+
+    def test_unlink_relationships(self):
+        """
+        Test unlinking children and siblings and ending a partnership.
+        """
+        self.john.unlink_child(self.emma)
+        self.assertEqual(self.john.get_immediate_family()["children"], ["Lucas"])
+        self.assertIsNone(self.emma.dad)
+
+        self.lucas.add_sibling(self.emma)
+        self.emma.unlink_sibling(self.lucas)
+        self.assertEqual(self.lucas.siblings, [])
+
+        self.john.set_partner(self.jane)
+        self.jane.end_partnership()
+        self.assertIsNone(self.john.partner)
+        self.assertEqual(self.john.get_past_partners(), ["Jane"])
+        self.assertEqual(self.jane.get_past_partners(), ["John"])
+        with self.assertRaises(ValueError):
+            self.jane.end_partnership()
+
+        self.family_tree.unlink_child("John", "Lucas")
+        self.assertEqual(self.john.children, [])
+        self.assertIsNone(self.lucas.dad)
+        with self.assertRaises(ValueError):
+            self.family_tree.unlink_siblings("Lucas", "Emma")
+
+    def test_removal_ignores_relatives_degree(self):
+        """
+        Test that removing a person does not search through their relatives' other relationships,
+        by counting the comparisons made while a well-connected relative's lists are updated.
+        """
+        class CountingPerson(Person):
+            comparisons = 0
+
+            def __eq__(self, other):
+                CountingPerson.comparisons += 1
+                return self is other
+
+            __hash__ = Person.__hash__
+
+        family_tree = FamilyTree()
+        hub = CountingPerson(name="Hub", gender="Male")
+        family_tree.add_person(hub)
+        for i in range(2000):
+            child = CountingPerson(name=f"Child_{i}", gender="Female")
+            family_tree.add_person(child)
+            hub.add_child(child)
+            partner = CountingPerson(name=f"Partner_{i}", gender="Female")
+            family_tree.add_person(partner)
+            hub.set_partner(partner)
+            sibling = CountingPerson(name=f"Sibling_{i}", gender="Male")
+            family_tree.add_person(sibling)
+            hub.add_sibling(sibling)
+
+        CountingPerson.comparisons = 0
+        for name in ("Child_1000", "Partner_1000", "Sibling_1000"):
+            family_tree.remove_person(name)
+        self.assertLess(CountingPerson.comparisons, 10)
+        self.assertEqual((len(hub.children), len(hub.last_partners), len(hub.siblings)), (1999, 1998, 1999))
+
+    def test_alive_on(self):
+        """
+        Test the "as of date" lifespan queries, including deceased members.
+        """
+        paul = DeceasedPerson(name="Paul", gender="Male", birth_date="01/01/1950", death_date="01/01/2000")
+        self.family_tree.add_person(paul)
+        alive_1990 = {person.name for person in self.family_tree.alive_on("01/06/1990")}
+        alive_2010 = {person.name for person in self.family_tree.alive_on("2010-01-01")}
+        self.assertEqual(alive_1990, {"John", "Jane", "Paul"})
+        self.assertEqual(alive_2010, {"John", "Jane", "Lucas", "Emma"})
+
+        self.family_tree.remove_person("Paul")
+        self.assertNotIn(paul, self.family_tree.alive_on("01/06/1990"))
+
+    def test_interval_index_with_changes(self):
+        """
+        Test that the interval index gives the same answers as a full scan while
+        intervals are added, replaced and removed between queries.
+        """
+        generator = random.Random(7)
+        index = IntervalIndex()
+        expected = {}
+        for step in range(3000):
+            key = generator.randrange(500)
+            if generator.random() < 0.25:
+                index.remove(key)
+                expected.pop(key, None)
+            else:
+                start = date(1900, 1, 1) + timedelta(days=generator.randrange(40000))
+                end = start + timedelta(days=generator.randrange(30000))
+                index.add(key, start, end)
+                expected[key] = (start, end)
+            if step % 10 == 0:
+                point = date(1900, 1, 1) + timedelta(days=generator.randrange(70000))
+                self.assertEqual(sorted(index.stab(point)),
+                                 sorted(key for key, (start, end) in expected.items() if start <= point <= end))
+
+    def test_update_dates(self):
+        """
+        Test that changing birth or death dates updates the "as of date" queries.
+        """
+        self.family_tree.record_death("John", "2020-01-01")
+        self.assertNotIn(self.john, self.family_tree.alive_on("2021-01-01"))
+        self.assertIn(self.john, self.family_tree.alive_on("2019-01-01"))
+
+        self.family_tree.update_dates("Emma", birth_date="01/01/2015")
+        self.assertNotIn(self.emma, self.family_tree.alive_on("2010-01-01"))
+        self.assertIn(self.emma, self.family_tree.alive_on("2016-01-01"))
+        with self.assertRaises(ValueError):
+            self.family_tree.record_death("John", "not a date")
+
+    def test_new_partnership_closes_open_one(self):
+        """
+        Test that recording a new open partnership ends the earlier open one.
+        """
+        clara = Person(name="Clara", gender="Female", birth_date="1983-02-02")
+        self.family_tree.add_person(clara)
+        self.family_tree.record_partnership("John", "Jane", "2000-01-01")
+        self.family_tree.record_partnership("John", "Clara", "2007-01-01")
+        self.assertEqual(self.family_tree.partners_on("John", "2008-01-01"), [clara])
+        self.assertEqual(self.family_tree.partners_on("John", "2003-01-01"), [self.jane])
+        self.assertEqual(self.family_tree.partners_on("Jane", "2008-01-01"), [])
+        self.assertEqual(self.john.partner, clara)
+
+    def test_back_dated_and_reordered_partnerships(self):
+        """
+        Test that an open partnership recorded with an earlier start ends when the later one
+        began, and that naming a couple in either order refers to the same partnership.
+        """
+        clara = Person(name="Clara", gender="Female", birth_date="1983-02-02")
+        self.family_tree.add_person(clara)
+        self.family_tree.record_partnership("John", "Clara", "2007-01-01")
+        self.family_tree.record_partnership("John", "Jane", "2000-01-01")
+        self.assertEqual(self.family_tree.partners_on("John", "2007-06-01"), [clara])
+        self.assertEqual(self.family_tree.partners_on("John", "2003-01-01"), [self.jane])
+        self.assertEqual(self.john.partner, clara)
+        self.assertEqual(self.john.get_past_partners(), ["Jane"])
+
+        self.family_tree.record_partnership("Lucas", "Emma", "2020-01-01")
+        self.family_tree.record_partnership("Emma", "Lucas", "2020-01-01", "2025-01-01")
+        self.assertEqual(self.family_tree.partners_on("Lucas", "2022-01-01"), [self.emma])
+        self.assertEqual(self.family_tree.partners_on("Lucas", "2026-01-01"), [])
+
+    def test_partners_and_household_on(self):
+        """
+        Test dated partnerships and household queries.
+        """
+        clara = Person(name="Clara", gender="Female", birth_date="1983-02-02")
+        self.family_tree.add_person(clara)
+        self.family_tree.record_partnership("John", "Jane", "2000-06-01", "2006-01-01")
+        self.family_tree.record_partnership("John", "Clara", "2007-01-01")
+
+        self.assertEqual(self.family_tree.partners_on("John", "2003-01-01"), [self.jane])
+        self.assertEqual(self.family_tree.partners_on("John", "2008-01-01"), [clara])
+        self.assertEqual(self.john.partner, clara)
+        self.assertEqual(self.john.get_past_partners(), ["Jane"])
+
+        household = self.family_tree.household_on("John", "2009-01-01")
+        self.assertEqual([person.name for person in household], ["John", "Clara", "Lucas", "Emma"])
+        household = self.family_tree.household_on("John", "2024-01-01")
+        self.assertEqual([person.name for person in household], ["John", "Clara", "Emma"])
+
+        self.family_tree.close_partnership("Clara", "2010-01-01")
+        self.assertEqual(self.family_tree.partners_on("John", "2011-01-01"), [])
+        self.assertEqual(self.family_tree.partnerships_on("2009-01-01"), [("Clara", "John")])
+
+        with self.assertRaises(ValueError):
+            self.family_tree.record_partnership("John", "John", "2012-01-01")
+        with self.assertRaises(ValueError):
+            self.family_tree.link_partners("John", "John")
+        self.assertIsNone(self.john.partner)
+        self.family_tree.remove_person("John")
+        self.assertNotIn("John", self.family_tree.members)
+
+    def test_merge_trees(self):
+        """
+        Test merging a second tree that shares some people with this one.
+        Duplicates are merged, new people are added, and unclear matches are reported.
+        """
+        other_tree = FamilyTree()
+        other_john = Person(name="john", gender="Male", birth_date="10/05/1980")
+        other_lucas = Person(name="Lucas", gender="Male", birth_date="30/03/2005")
+        other_emma = Person(name="Emma", gender="Female", birth_date="12/11/2008")
+        other_mia = Person(name="Mia", gender="Female", birth_date="01/01/2012")
+        other_jane = Person(name="Jane", gender="Female", birth_date="01/01/1982")
+        other_john.add_child(other_lucas)
+        other_john.add_child(other_emma)
+        other_john.add_child(other_mia)
+        for person in (other_john, other_lucas, other_emma, other_mia, other_jane):
+            other_tree.add_person(person)
+
+        report = self.family_tree.merge(other_tree)
+
+        self.assertEqual([(name, match) for name, match, score in report["merged"]],
+                         [("john", "John"), ("Lucas", "Lucas"), ("Emma", "Emma")])
+        self.assertEqual(report["added"], ["Mia"])
+        self.assertEqual(report["review"], [("Jane", [("Jane", 0.0)])])
+        self.assertEqual(len(self.family_tree.members), 5)
+        self.assertEqual(self.john.get_immediate_family()["children"], ["Lucas", "Emma", "Mia"])
+        self.assertIs(self.family_tree.get_person("Mia").dad, self.john)
+        self.assertIs(other_mia.dad, other_john)
+
+    def test_merge_identical_trees(self):
+        """
+        Test that merging a tree with a copy of itself finds every person, including
+        people with no relatives, by comparing their own details.
+        """
+        other_tree = FamilyTree()
+        for person in self.family_tree.members.values():
+            other_tree.add_person(Person(name=person.name, gender=person.gender, birth_date=person.birth_date))
+        other_tree.get_person("John").add_child(other_tree.get_person("Lucas"))
+        other_tree.get_person("John").add_child(other_tree.get_person("Emma"))
+
+        report = self.family_tree.merge(other_tree)
+
+        self.assertEqual(len(report["merged"]), 4)
+        self.assertEqual(report["review"], [])
+        self.assertEqual(len(self.family_tree.members), 4)
+        self.assertEqual(self.john.get_immediate_family()["children"], ["Lucas", "Emma"])
+
+    def test_merge_holds_back_weak_matches(self):
+        """
+        Test that a weak match is reported for review and not added, even when its
+        exact name is not taken.
+        """
+        other_tree = FamilyTree()
+        other_tree.add_person(Person(name="emma", gender="Female", birth_date="01/01/2008"))
+
+        report = self.family_tree.merge(other_tree)
+
+        self.assertEqual(report["review"], [("emma", [("Emma", 0.0)])])
+        self.assertEqual(report["added"], [])
+        self.assertNotIn("emma", self.family_tree.members)
+
+    def test_partitioned_queries(self):
+        """
+        Test splitting the tree into branch shards and running queries on them
+        in worker processes.
+        """
+        grandma = Person(name="Rose", gender="Female", birth_date="1950-05-01")
+        grandma.add_child(self.jane)
+        self.jane.add_child(self.lucas)
+        self.family_tree.add_person(grandma)
+        for i in range(4):
+            child = DeceasedPerson(name=f"Kid_{i}", gender="Male", birth_date=f"01/05/{2000 + i}",
+                                   death_date=f"01/05/{2060 + i}")
+            self.family_tree.add_person(child)
+            self.emma.add_child(child)
+
+        shards = partition_tree(self.family_tree, 2)
+        self.assertEqual(sorted(len(shard.members) for shard in shards), [4, 5])
+        self.assertEqual(count_cut_edges(self.family_tree, shards), 1)
+
+        with ShardCoordinator(shards, max_workers=2) as coordinator:
+            statistics = coordinator.get_statistics()
+            birthdays = coordinator.get_upcoming_birthdays(5)
+            descendants = coordinator.get_descendant_counts()
+
+        self.assertEqual(statistics["average_age_at_death"], self.family_tree.get_average_age_at_death())
+        self.assertEqual(statistics["total_children"], self.family_tree.get_total_number_of_children())
+        self.assertEqual(sorted(birthdays), ["John", "Kid_0", "Kid_1", "Kid_2", "Kid_3", "Rose"])
+        self.assertEqual(descendants["Rose"], 2)
+        self.assertEqual(descendants["John"], 6)
+        self.assertEqual(descendants["Lucas"], 0)
+
+    def test_partitioned_descendants_with_cycles(self):
+        """
+        Test counting descendants when parents form a cycle inside a shard and across shards,
+        and along a line of descent too long to follow recursively.
+        """
+        people = {name: Person(name=name, gender="Male") for name in ("A", "B", "C", "D", "E")}
+        for parent, child in (("A", "B"), ("B", "A"), ("B", "C"), ("C", "D"), ("D", "A"), ("C", "E")):
+            people[parent].add_child(people[child])
+        shards = [Shard(0), Shard(1)]
+        for name, shard_index in (("A", 0), ("B", 0), ("C", 1), ("D", 1), ("E", 1)):
+            shards[shard_index].add_member(people[name])
+        shards[0].stubs["C"] = 1
+        shards[1].stubs["A"] = 0
+
+        with ShardCoordinator(shards, max_workers=2) as coordinator:
+            descendants = coordinator.get_descendant_counts()
+        self.assertEqual(descendants, {"A": 4, "B": 4, "C": 4, "D": 4, "E": 0})
+
+        line = Shard(0)
+        ancestor = Person(name="Line_0", gender="Male")
+        for i in range(1, 5000):
+            child = Person(name=f"Line_{i}", gender="Male")
+            ancestor.add_child(child)
+            line.add_member(ancestor)
+            ancestor = child
+        line.add_member(ancestor)
+        self.assertEqual(len(shard_descendants(line)["Line_0"][0]), 4999)
+
+    def test_save_and_load(self):
+        """
+        Test that a saved tree loads with the same people, relationships and dated partnerships.
+        """
+        paul = DeceasedPerson(name="Paul", gender="Male", birth_date="01/01/1950", death_date="01/01/2000")
+        self.family_tree.add_person(paul)
+        self.family_tree.record_partnership("John", "Jane", "2004-01-01")
+        self.lucas.add_sibling(self.emma)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tree.json")
+            self.family_tree.save(path)
+            loaded = FamilyTree.load(path)
+
+        self.assertEqual(list(loaded.members), list(self.family_tree.members))
+        for name, person in self.family_tree.members.items():
+            self.assertEqual(loaded.get_person(name).get_full_details(), person.get_full_details())
+        self.assertIsInstance(loaded.get_person("Paul"), DeceasedPerson)
+        self.assertEqual(loaded.get_average_age_at_death(), 50)
+        self.assertEqual([p.name for p in loaded.partners_on("Jane", "2010-01-01")], ["John"])
+
+    def test_cli_query(self):
+        """
+        Test running CLI subcommands against a saved tree.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tree.json")
+            self.family_tree.save(path)
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                self.assertEqual(cli.main(["query", "person", "John", "--tree", path]), 0)
+                self.assertEqual(cli.main(["stats", "--tree", path]), 0)
+                self.assertEqual(cli.main(["birthdays", "8", "--tree", path]), 0)
+            with contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(cli.main(["relatives", "Nobody", "--tree", path]), 1)
+
+        self.assertIn("Name: John, Gender: Male", output.getvalue())
+        self.assertIn("Total Number of Children: 2", output.getvalue())
+        self.assertIn("- Jane (1982-08-25)", output.getvalue())
+
+    def test_cli_server_round_trip(self):
+        """
+        Test loading a tree as a server, querying it and stopping it, including after bad connections.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tree.json")
+            self.family_tree.save(path)
+            with socket.socket() as probe:
+                probe.bind(("127.0.0.1", 0))
+                port = probe.getsockname()[1]
+            address = f"127.0.0.1:{port}"
+            environment = dict(os.environ, FAMILYTREE_AUTHKEY="round-trip-key")
+            server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py"),
+                                       "load", path, "--serve", address],
+                                      env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            try:
+                # Connecting and hanging up straight away is also a dropped client the server must survive
+                deadline = time.monotonic() + 10
+                while True:
+                    try:
+                        socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                        break
+                    except OSError:
+                        if time.monotonic() > deadline or server.poll() is not None:
+                            self.fail("The server did not start.")
+                        time.sleep(0.05)
+
+                with self.assertRaises(AuthenticationError):
+                    Client(("127.0.0.1", port), authkey=b"wrong-key")
+
+                # A client that connects and then says nothing must not hold up the others
+                output = io.StringIO()
+                with socket.create_connection(("127.0.0.1", port)), \
+                        mock.patch.dict(os.environ, {"FAMILYTREE_AUTHKEY": "round-trip-key"}), \
+                        contextlib.redirect_stdout(output):
+                    self.assertEqual(cli.main(["stats", "--connect", address]), 0)
+                    with contextlib.redirect_stderr(io.StringIO()):
+                        self.assertEqual(cli.main(["export", os.path.join(directory, "out.json"),
+                                                   "--connect", address]), 1)
+                    self.assertEqual(cli.main(["stop", "--connect", address]), 0)
+                    self.assertEqual(server.wait(timeout=10), 0)
+            finally:
+                if server.poll() is None:
+                    server.kill()
+                    server.wait()
+                server.stderr.close()
+
+        self.assertIn("Total Number of Children: 2", output.getvalue())
+        self.assertIn("Server stopped.", output.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(directory, "out.json")))
+
+    def test_grouped_statistics(self):
+        """
+        Test grouped statistics, checking them against the existing global statistics.
+        """
+        for i, age in enumerate((50, 70, 90)):
+            self.family_tree.add_person(DeceasedPerson(name=f"Ancestor_{i}", gender="Male",
+                                                       birth_date="01/01/1900", death_date=f"01/01/{1900 + age}"))
+
+        by_gender = self.family_tree.get_grouped_statistics("gender")
+        self.assertEqual(list(by_gender), ["Female", "Male"])
+        self.assertEqual(by_gender["Male"]["count"], 5)
+        self.assertEqual(by_gender["Male"]["lifespan"]["mean"], self.family_tree.get_average_age_at_death())
+        self.assertEqual(by_gender["Male"]["lifespan"]["quantiles"][0.5], 70)
+        self.assertEqual(by_gender["Male"]["lifespan"]["histogram"], {50: 1, 70: 1, 90: 1})
+        self.assertEqual(by_gender["Male"]["children"]["histogram"], {0: 4, 2: 1})
+        self.assertEqual(by_gender["Male"]["age_at_first_child"]["quantiles"][0.5], 25)
+
+        by_generation = self.family_tree.get_grouped_statistics("generation")
+        self.assertEqual({key: value["count"] for key, value in by_generation.items()}, {0: 5, 1: 2})
+        by_decade = self.family_tree.get_grouped_statistics("birth_decade")
+        self.assertEqual(by_decade[2000]["count"], 2)
+        by_branch = self.family_tree.get_grouped_statistics("branch")
+        self.assertEqual(by_branch["John"]["count"], 3)
+        with self.assertRaises(ValueError):
+            self.family_tree.get_grouped_statistics("height")
+
+    def test_generations_with_parent_cycle(self):
+        """
+        Test that people recorded as their own ancestor get no generation instead of hanging.
+        """
+        for name, gender in (("Loop_A", "Male"), ("Loop_B", "Female"), ("Loop_C", "Male")):
+            self.family_tree.add_person(Person(name=name, gender=gender))
+        self.family_tree.members["Loop_A"].add_child(self.family_tree.members["Loop_B"])
+        self.family_tree.members["Loop_B"].add_child(self.family_tree.members["Loop_A"])
+        self.family_tree.members["Loop_A"].add_child(self.family_tree.members["Loop_C"])
+
+        by_generation = self.family_tree.get_grouped_statistics("generation")
+        self.assertEqual({key: value["count"] for key, value in by_generation.items()}, {0: 2, 1: 2, None: 3})
+
+    def test_concurrent_mutations(self):
+        """
+        Stress test that changes relationships from many threads at once, then checks
+        that every relationship is still consistent on both sides.
+        """
+        class YieldingPerson(Person):
+            """
+            A person that lets other threads run before every attribute change, so that
+            a relationship half way through being changed is likely to be seen by another thread.
+            """
+
+            def __setattr__(self, name, value):
+                time.sleep(0)
+                super().__setattr__(name, value)
+
+        names = [f"Person_{i}" for i in range(12)]
+        genders = random.Random(0)
+        for name in names:
+            self.family_tree.add_person(YieldingPerson(name=name, gender=genders.choice(["Male", "Female"]),
+                                                       birth_date="01/01/1950"))
+        errors = []
+
+        start = threading.Barrier(16)
+
+        def worker(seed):
+            generator = random.Random(seed)
+            start.wait()
+            for _ in range(1000):
+                first, second = generator.sample(names, 2)
+                operation = generator.randrange(8)
+                try:
+                    if operation == 0:
+                        self.family_tree.link_child(first, second)
+                    elif operation == 1:
+                        self.family_tree.link_siblings(first, second)
+                    elif operation == 2:
+                        self.family_tree.link_partners(first, second)
+                    elif operation == 3:
+                        self.family_tree.record_partnership(first, second, "01/01/1980",
+                                                            generator.choice([None, "01/01/1990"]))
+                    elif operation == 4:
+                        self.family_tree.close_partnership(first, "01/01/2000")
+                    elif operation == 5:
+                        self.family_tree.unlink_child(first, second)
+                    elif operation == 6:
+                        self.family_tree.unlink_siblings(first, second)
+                    else:
+                        self.family_tree.remove_person(first)
+                        self.family_tree.add_person(YieldingPerson(name=first, gender="Female", birth_date="01/01/1950"))
+                except ValueError as error:
+                    # Someone else removed one of the people, or there was no partner to leave, but a
+                    # failed list.remove means a relationship was only recorded on one side
+                    if "not in list" in str(error):
+                        errors.append(error)
+                except Exception as error:
+                    errors.append(error)
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(16)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        self.assertEqual(errors, [])
+        members = self.family_tree.members
+        for name, person in members.items():
+            for relative in person.get_relatives():
+                self.assertIs(members.get(relative.name), relative)
+            if person.partner is not None:
+                self.assertIs(person.partner.partner, person)
+            for sibling in person.siblings:
+                self.assertIn(person, sibling.siblings)
+            for child, count in Counter(person.children).items():
+                self.assertEqual(child.parents.count(person), count)
+            for parent, count in Counter(person.parents).items():
+                self.assertEqual(parent.children.count(person), count)
+            for past_partner in person.last_partners:
+                self.assertIn(person, past_partner.past_partner_of)
+            for other in person.past_partner_of:
+                self.assertIn(person, other.last_partners)
+        for key in self.family_tree.partnerships.intervals:
+            self.assertIn(key, self.family_tree.partnership_keys[key[0]])
+            self.assertIn(key, self.family_tree.partnership_keys[key[1]])
+            self.assertIn(key[0], members)
+            self.assertIn(key[1], members)
+
+    def test_reads_during_mutations(self):
+        """
+        Test that statistics, birthdays and saving work while other threads add and remove people.
+        """
+        family_tree = FamilyTree()
+        for i in range(200):
+            family_tree.add_person(Person(name=f"Reader_{i}", gender="Male", birth_date="01/03/1950"))
+        stop = threading.Event()
+        errors = []
+
+        def writer(seed):
+            generator = random.Random(seed)
+            while not stop.is_set():
+                name = f"Writer_{seed}_{generator.randrange(50)}"
+                try:
+                    family_tree.remove_person(name)
+                except ValueError:
+                    family_tree.add_person(Person(name=name, gender="Female", birth_date="01/03/1990"))
+
+        with tempfile.TemporaryDirectory() as directory:
+            threads = [threading.Thread(target=writer, args=(seed,)) for seed in range(4)]
+            for thread in threads:
+                thread.start()
+            try:
+                for _ in range(50):
+                    try:
+                        family_tree.get_total_number_of_children()
+                        family_tree.get_average_age_at_death()
+                        family_tree.get_grouped_statistics("generation")
+                        BirthdayManager(family_tree).get_upcoming_birthdays(3)
+                        family_tree.save(os.path.join(directory, "tree.json"))
+                    except Exception as error:
+                        errors.append(error)
+            finally:
+                stop.set()
+                for thread in threads:
+                    thread.join()
+
+        self.assertEqual(errors, [])
+
     def test_large_family_tree(self):
         """
         Performance test for a very large family tree with over 10,000 members.